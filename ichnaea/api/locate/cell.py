@@ -1,7 +1,6 @@
 """Search implementation using a cell database."""
 
 from collections import defaultdict
-import math
 
 import numpy
 from sqlalchemy import select
@@ -22,7 +21,7 @@ from ichnaea.api.locate.score import (
     area_score,
     station_score,
 )
-from ichnaea.geocalc import distance
+from ichnaea.geocalc import distance_array
 from ichnaea.geocode import GEOCODER
 from ichnaea.models import (
     area_id,
@@ -125,25 +124,23 @@ def aggregate_cell_position(networks, min_accuracy, max_accuracy):
         score = networks[0]['score']
         return (float(lat), float(lon), float(radius), float(score))
 
-    points = numpy.array(
-        [(net['lat'], net['lon']) for net in networks],
-        dtype=numpy.double)
-
-    weights = numpy.array([
-        net['score'] *
-        min(math.sqrt(2000.0 / net['age']), 1.0) /
-        math.pow(net['signalStrength'], 2)
-        for net in networks],
-        dtype=numpy.double)
+    # Work on whole columns of the networks array at once,
+    # instead of accessing each network row by row.
+    lats = networks['lat']
+    lons = networks['lon']
+    signal = networks['signalStrength'].astype(numpy.double)
+    points = numpy.column_stack((lats, lons))
+    weights = (
+        networks['score'] *
+        numpy.minimum(numpy.sqrt(2000.0 / networks['age']), 1.0) /
+        (signal * signal))
 
     lat, lon = numpy.average(points, axis=0, weights=weights)
     score = networks['score'].sum()
 
     # Guess the accuracy as the 95th percentile of the distances
     # from the lat/lon to the positions of all networks.
-    distances = numpy.array([
-        distance(lat, lon, net['lat'], net['lon'])
-        for net in networks], dtype=numpy.double)
+    distances = distance_array(lat, lon, lats, lons)
     accuracy = min(max(numpy.percentile(distances, 95),
                        min_accuracy), max_accuracy)
 
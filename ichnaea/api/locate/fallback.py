@@ -296,10 +296,18 @@ class FallbackCache(object):
         self.cache_key_blue = self.cache_keys[schema]['fallback_blue']
         self.cache_key_cell = self.cache_keys[schema]['fallback_cell']
         self.cache_key_wifi = self.cache_keys[schema]['fallback_wifi']
+        self._stat_tags = {}
 
     def _stat_count(self, fallback_name, status):
-        tags = ['fallback_name:%s' % fallback_name,
-                'status:%s' % status]
+        # The tags only depend on the fallback name and status,
+        # so format them once per combination and reuse them.
+        key = (fallback_name, status)
+        tags = self._stat_tags.get(key)
+        if tags is None:
+            tags = self._stat_tags[key] = (
+                'fallback_name:%s' % fallback_name,
+                'status:%s' % status,
+            )
         self.stats_client.incr('locate.fallback.cache', tags=tags)
 
     def _should_cache(self, query):
@@ -407,19 +415,21 @@ class FallbackCache(object):
             self._stat_count(fallback_name, 'hit')
             results = list(clustered_results.values())[0]
 
-            circles = numpy.array(
-                [(res.lat, res.lon, res.accuracy) for res in results],
+            points = numpy.array(
+                [(res.lat, res.lon) for res in results],
                 dtype=numpy.double)
-            points, accuracies = numpy.hsplit(circles, [2])
 
             lat, lon = points.mean(axis=0)
             lat = float(lat)
             lon = float(lon)
 
+            # Track the running maximum in a single pass over the
+            # results, without creating an array row per result.
             radius = 0.0
-            for circle in circles:
-                p_dist = distance(lat, lon, circle[0], circle[1]) + circle[2]
-                radius = max(radius, p_dist)
+            for res in results:
+                p_dist = distance(lat, lon, res.lat, res.lon) + res.accuracy
+                if p_dist > radius:
+                    radius = p_dist
 
             return ExternalResult(
                 lat=lat,
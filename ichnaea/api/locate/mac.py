@@ -2,7 +2,6 @@
 
 from collections import defaultdict
 import itertools
-import math
 
 import numpy
 from scipy.cluster import hierarchy
@@ -10,7 +9,10 @@ from scipy.optimize import leastsq
 from sqlalchemy import select
 
 from ichnaea.api.locate.score import station_score
-from ichnaea.geocalc import distance
+from ichnaea.geocalc import (
+    distance,
+    distance_array,
+)
 from ichnaea.models import (
     decode_mac,
     encode_mac,
@@ -109,29 +111,26 @@ def cluster_networks(models, lookups,
 def aggregate_mac_position(networks, minimum_accuracy):
     # Idea based on https://gis.stackexchange.com/questions/40660
 
-    def func(point, points):
-        return numpy.array([
-            distance(p['lat'], p['lon'], point[0], point[1]) *
-            min(math.sqrt(2000.0 / p['age']), 1.0) /
-            math.pow(p['signalStrength'], 2)
-            for p in points])
+    # Work on whole columns of the networks array at once,
+    # instead of accessing each network row by row.
+    lats = networks['lat']
+    lons = networks['lon']
+    age_factor = numpy.minimum(numpy.sqrt(2000.0 / networks['age']), 1.0)
+    signal = networks['signalStrength'].astype(numpy.double)
+    signal_factor = signal * signal
 
-    # Guess initial position as the weighted mean over all networks.
-    points = numpy.array(
-        [(net['lat'], net['lon']) for net in networks],
-        dtype=numpy.double)
+    def func(point, lats, lons):
+        return (distance_array(point[0], point[1], lats, lons) *
+                age_factor / signal_factor)
 
-    weights = numpy.array([
-        net['score'] *
-        min(math.sqrt(2000.0 / net['age']), 1.0) /
-        math.pow(net['signalStrength'], 2)
-        for net in networks],
-        dtype=numpy.double)
+    # Guess initial position as the weighted mean over all networks.
+    points = numpy.column_stack((lats, lons))
+    weights = networks['score'] * age_factor / signal_factor
 
     initial = numpy.average(points, axis=0, weights=weights)
 
     (lat, lon), cov_x, info, mesg, ier = leastsq(
-        func, initial, args=networks, full_output=True)
+        func, initial, args=(lats, lons), full_output=True)
 
     if ier not in (1, 2, 3, 4):  # pragma: no cover
         # No solution found, use initial estimate.
@@ -139,9 +138,7 @@ def aggregate_mac_position(networks, minimum_accuracy):
 
     # Guess the accuracy as the 95th percentile of the distances
     # from the lat/lon to the positions of all networks.
-    distances = numpy.array([
-        distance(lat, lon, net['lat'], net['lon'])
-        for net in networks], dtype=numpy.double)
+    distances = distance_array(lat, lon, lats, lons)
     accuracy = max(numpy.percentile(distances, 95), minimum_accuracy)
 
     return (float(lat), float(lon), float(accuracy))
@@ -4,6 +4,7 @@ from ipaddress import ip_address
 
 from ichnaea.api.locate.constants import (
     DataAccuracy,
+    DataSource,
     MIN_BLUES_IN_QUERY,
     MIN_WIFIS_IN_QUERY,
 )
@@ -26,6 +27,11 @@ METRIC_MAPPING = {
     2: 'many',
 }
 
+# Metric tags only depend on the enum names, so format them on import.
+ACCURACY_TAGS = {
+    accuracy: 'accuracy:%s' % accuracy.name for accuracy in DataAccuracy}
+SOURCE_TAGS = {source: 'source:%s' % source.name for source in DataSource}
+
 
 class Query(object):
 
@@ -387,11 +393,11 @@ class Query(object):
 
         tags = [
             'fallback_allowed:%s' % allow_fallback,
-            'accuracy:%s' % self.expected_accuracy.name,
+            ACCURACY_TAGS[self.expected_accuracy],
             'status:%s' % status,
         ]
         if status == 'hit' and source:
-            tags.append('source:%s' % source.name)
+            tags.append(SOURCE_TAGS[source])
         self._emit_region_stat('result', tags)
 
     def emit_source_stats(self, source, results):
@@ -408,8 +414,8 @@ class Query(object):
                 break
 
         tags = [
-            'source:%s' % source.name,
-            'accuracy:%s' % self.expected_accuracy.name,
+            SOURCE_TAGS[source],
+            ACCURACY_TAGS[self.expected_accuracy],
             'status:%s' % status,
         ]
         self._emit_region_stat('source', tags)
@@ -22,6 +22,19 @@ class Source(object):
     result_type = None
     source = None
 
+    _result_factory = None
+
+    def __init_subclass__(cls, **kw):
+        super(Source, cls).__init_subclass__(**kw)
+        # Bind the source specific result arguments once per class,
+        # instead of creating a new partial for every instance.
+        if cls.result_type is not None:
+            cls._result_factory = partial(
+                cls.result_type,
+                source=cls.source,
+                fallback=cls.fallback_field,
+            )
+
     def __init__(self, geoip_db, raven_client, redis_client,
                  stats_client, data_queues):
         self.geoip_db = geoip_db
@@ -29,11 +42,7 @@ class Source(object):
         self.redis_client = redis_client
         self.stats_client = stats_client
         self.data_queues = data_queues
-        self.result_type = partial(
-            self.result_type,
-            source=self.source,
-            fallback=self.fallback_field,
-        )
+        self.result_type = self._result_factory
 
     def should_search(self, query, results):
         """
@@ -48,10 +57,11 @@ class Source(object):
 
         :rtype: bool
         """
-        if self.fallback_field is not None:
-            return bool(getattr(query.fallback, self.fallback_field, True))
+        fallback_field = self.fallback_field
+        if fallback_field is None:
+            return True
 
-        return True
+        return bool(getattr(query.fallback, fallback_field, True))
 
     def search(self, query):
         """Provide a type specific possibly empty result list.
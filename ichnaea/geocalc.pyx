@@ -22,6 +22,11 @@ cdef double EARTH_FLATTENING = 0.0033528106647474805  # 1.0 / 298.257223563
 cdef double VINCENTY_CUTOFF = 0.00000000001  # 10e-12
 cdef int VINCENTY_ITERATIONS = 25
 
+# The spherical Haversine distance differs from the ellipsoidal Vincenty
+# distance by less than 1%, so only points with a Haversine distance of
+# at least 98% of the maximum can be the farthest point.
+cdef double MAX_DISTANCE_CANDIDATE = 0.98
+
 cdef double* RANDOM_LAT = [
     0.8218, 0.1382, 0.8746, 0.0961, 0.8159, 0.2876, 0.6191, 0.0897,
     0.3755, 0.9412, 0.3231, 0.5353, 0.225, 0.0555, 0.1591, 0.3871,
@@ -87,6 +92,21 @@ cdef inline double rad2deg(double radians):
     return radians * 180.0 / M_PI
 
 
+cdef inline double haversine_term(double lat1, double lon1,
+                                  double lat2, double lon2):
+    # The squared half chord length between two points on the unit
+    # sphere. It grows monotonically with the distance between them.
+    cdef double dLat, dLon
+
+    dLat = deg2rad(lat2 - lat1) / 2.0
+    dLon = deg2rad(lon2 - lon1) / 2.0
+
+    lat1 = deg2rad(lat1)
+    lat2 = deg2rad(lat2)
+
+    return sin(dLat) ** 2 + cos(lat1) * cos(lat2) * sin(dLon) ** 2
+
+
 cpdef tuple bbox(double lat, double lon, double meters):
     """
     Return a bounding box around the passed in lat/lon position.
@@ -131,6 +151,29 @@ cpdef double distance(double lat1, double lon1,
         return haversine_distance(lat1, lon1, lat2, lon2)
 
 
+cpdef ndarray distance_array(double lat, double lon,
+                             ndarray[double_t, ndim=1] lats,
+                             ndarray[double_t, ndim=1] lons):
+    """
+    Compute the distances in meters from the given lat/lon point to
+    each of the points described by the lats and lons arrays.
+
+    The distances are calculated in a single C loop, avoiding a
+    Python level function call per point.
+    """
+    cdef ndarray[double_t, ndim=1] result
+    cdef Py_ssize_t i, length
+
+    length = lats.shape[0]
+    if lons.shape[0] != length:
+        raise ValueError('lats and lons need to have the same length.')
+
+    result = numpy.empty(length, dtype=numpy.double)
+    for i in range(length):
+        result[i] = distance(lat, lon, lats[i], lons[i])
+    return result
+
+
 cpdef double haversine_distance(double lat1, double lon1,
                                 double lat2, double lon2):
     """
@@ -152,15 +195,9 @@ cpdef double haversine_distance(double lat1, double lon1,
     equator, though generally below 0.3%, depending on latitude and
     direction of travel.
     """
-    cdef double a, c, dLat, dLon
-
-    dLat = deg2rad(lat2 - lat1) / 2.0
-    dLon = deg2rad(lon2 - lon1) / 2.0
-
-    lat1 = deg2rad(lat1)
-    lat2 = deg2rad(lat2)
+    cdef double a, c
 
-    a = sin(dLat) ** 2 + cos(lat1) * cos(lat2) * sin(dLon) ** 2
+    a = haversine_term(lat1, lon1, lat2, lon2)
     c = asin(fmin(1, sqrt(a)))
     return 1000.0 * 2.0 * EARTH_RADIUS * c
 
@@ -436,12 +473,34 @@ cpdef double max_distance(double lat, double lon,
     Returns the maximum distance from the given lat/lon point to any of
     the provided points in the points array.
     """
-    cdef double dist, p_lat, p_lon, result
+    cdef ndarray[double_t, ndim=1] terms
+    cdef double dist, max_term, result, threshold
+    cdef Py_ssize_t i, length
+
+    # Use typed indexing, so the loops run in C without creating
+    # a Python object for each row.
+    length = points.shape[0]
+    if length == 0:
+        return 0.0
+
+    # Find the farthest point using the cheap Haversine term, which
+    # needs no square root or arc sine per point.
+    terms = numpy.empty(length, dtype=numpy.double)
+    max_term = 0.0
+    for i in range(length):
+        terms[i] = haversine_term(lat, lon, points[i, 0], points[i, 1])
+        max_term = fmax(max_term, terms[i])
+
+    # Only calculate the exact distance for the candidate points
+    # which could be the farthest one.
+    threshold = sin(
+        MAX_DISTANCE_CANDIDATE * asin(fmin(1, sqrt(max_term)))) ** 2
 
     result = 0.0
-    for p_lat, p_lon in points:
-        dist = distance(lat, lon, p_lat, p_lon)
-        result = fmax(result, dist)
+    for i in range(length):
+        if terms[i] >= threshold:
+            dist = distance(lat, lon, points[i, 0], points[i, 1])
+            result = fmax(result, dist)
     return result
 
 
@@ -1,7 +1,12 @@
 """Functionality related to statsd, sentry and freeform logging."""
-from collections import deque
+from functools import (
+    lru_cache,
+    wraps,
+)
+from inspect import iscoroutinefunction
 import logging
 from logging.config import dictConfig
+from random import random
 import time
 
 from pyramid.httpexceptions import (
@@ -14,6 +19,7 @@ from raven.transport.gevent import GeventedHTTPTransport
 from raven.transport.http import HTTPTransport
 from raven.transport.threaded import ThreadedHTTPTransport
 from datadog.dogstatsd.base import DogStatsd
+from datadog.dogstatsd.context import TimedContextManagerDecorator
 
 from ichnaea.config import (
     RELEASE,
@@ -69,6 +75,9 @@ RAVEN_TRANSPORTS = {
     'threaded': ThreadedHTTPTransport,
 }
 
+STATUS_TAGS = {code: 'status:%s' % code for code in (
+    200, 204, 301, 302, 304, 400, 401, 403, 404, 405, 500, 502, 503)}
+
 
 def configure_logging():
     """Configure basic Python logging."""
@@ -119,12 +128,35 @@ def configure_stats(_client=None):  # pragma: no cover
     return client
 
 
+def quote_statsd_path(path):
+    """Convert a URI path to a statsd acceptable metric name."""
+    return path.replace('/', '.').lstrip('.').replace('@', '-')
+
+
+@lru_cache(maxsize=1024)
+def _request_tags(path, method):
+    # Request paths and methods repeat heavily, so only convert them
+    # into tags once, with a single cache lookup per request.
+    # They are user input, so the cache is bounded.
+    return (
+        'path:%s' % quote_statsd_path(path),
+        'method:%s' % method.lower(),
+    )
+
+
 def log_tween_factory(handler, registry):
     """A logging tween, doing automatic statsd and raven collection."""
 
+    # Look these up once when the app is created, the registry
+    # doesn't change while requests are processed.
+    raven_client = registry.raven_client
+    skip_logging = registry.skip_logging
+    stats_client = registry.stats_client
+    monotonic = time.monotonic
+
     def log_tween(request):
-        if (request.path in registry.skip_logging or
-                request.path.startswith('/static')):
+        path = request.path
+        if path in skip_logging or path.startswith('/static'):
             # shortcut handling for static assets
             try:
                 return handler(request)
@@ -132,68 +164,91 @@ def log_tween_factory(handler, registry):
                 # don't capture exceptions for normal responses
                 raise
             except Exception:  # pragma: no cover
-                registry.raven_client.captureException()
+                raven_client.captureException()
                 raise
 
-        stats_client = registry.stats_client
-        start = time.time()
-        statsd_tags = [
-            # Convert a URI to a statsd acceptable metric name
-            'path:%s' % request.path.replace(
-                '/', '.').lstrip('.').replace('@', '-'),
-            'method:%s' % request.method.lower(),
-        ]
-
-        def timer_send():
-            duration = int(round((time.time() - start) * 1000))
-            stats_client.timing('request', duration, tags=statsd_tags)
+        start = monotonic()
+        statsd_tags = _request_tags(path, request.method)
 
-        def counter_send(status_code):
-            stats_client.incr('request',
-                              tags=statsd_tags + ['status:%s' % status_code])
+        def stats_send(status_code):
+            duration = int(round((monotonic() - start) * 1000))
+            status_tag = STATUS_TAGS.get(status_code)
+            if status_tag is None:
+                status_tag = 'status:%s' % status_code
+            # Send the timer and counter in a single packet.
+            stats_client.send_batch((
+                ('request', 'ms', duration, statsd_tags),
+                ('request', 'c', 1, statsd_tags + (status_tag,)),
+            ))
 
         try:
             response = handler(request)
-            timer_send()
-            counter_send(response.status_code)
+            stats_send(response.status_code)
             return response
         except (BaseClientError, HTTPRedirection) as exc:
             # don't capture exceptions
-            timer_send()
-            counter_send(exc.status_code)
+            stats_send(exc.status_code)
             raise
         except HTTPClientError:
             # ignore general client side errors
             raise
         except Exception as exc:
-            timer_send()
             if isinstance(exc, HTTPException):
                 status = exc.status_code
             else:  # pragma: no cover
                 status = 500
-            counter_send(status)
-            registry.raven_client.captureException()
+            stats_send(status)
+            raven_client.captureException()
             raise
 
     return log_tween
 
 
-class DebugRavenClient(RavenClient):
+class DebugMessages(object):
+    """
+    A mixin keeping the most recent messages in a fixed size
+    ring buffer, exposed as an inspectable message queue.
+    """
+
+    msgs_size = 100
+
+    def _init_msgs(self):
+        self._msgs_buffer = [None] * self.msgs_size
+        self._msgs_count = 0
+
+    def _add_msg(self, msg):
+        self._msgs_buffer[self._msgs_count % self.msgs_size] = msg
+        self._msgs_count += 1
+
+    def _clear_msgs(self):
+        self._msgs_count = 0
+
+    @property
+    def msgs(self):
+        """A list of the most recent messages, oldest first."""
+        count = self._msgs_count
+        if count <= self.msgs_size:
+            return self._msgs_buffer[:count]
+        start = count % self.msgs_size
+        return self._msgs_buffer[start:] + self._msgs_buffer[:start]
+
+
+class DebugRavenClient(RavenClient, DebugMessages):
     """An in-memory raven client with an inspectable message queue."""
 
     def __init__(self, *args, **kw):
         super(DebugRavenClient, self).__init__(*args, **kw)
-        self.msgs = deque(maxlen=100)
+        self._init_msgs()
 
     def _clear(self):
-        self.msgs.clear()
+        self._clear_msgs()
         self.context.clear()
 
     def is_enabled(self):
         return True
 
     def send(self, auth_header=None, **data):
-        self.msgs.append(data)
+        self._add_msg(data)
         self._successful_send()
 
     def check(self, expected=()):
@@ -207,25 +262,78 @@ class DebugRavenClient(RavenClient):
         The names are matched via startswith against the captured exception
         messages.
         """
-        messages = [msg['message'] for msg in self.msgs]
+        msgs = self.msgs
+        messages = [msg['message'] for msg in msgs]
         matched_msgs = []
         for exp in expected:
             count = 1
             name = exp
             if isinstance(exp, tuple):
                 name, count = exp
-            matches = [msg for msg in self.msgs
+            matches = [msg for msg in msgs
                        if msg['message'].startswith(name)]
             matched_msgs.extend(matches)
             assert len(matches) == count, messages
 
-        for msg in matched_msgs:
-            self.msgs.remove(msg)
+        matched_ids = set([id(msg) for msg in matched_msgs])
+        self._clear_msgs()
+        for msg in msgs:
+            if id(msg) not in matched_ids:
+                self._add_msg(msg)
+
+
+class MonotonicTimer(TimedContextManagerDecorator):
+    """
+    A timing context manager and decorator, measuring the elapsed
+    time with the monotonic clock instead of the wall clock.
+    """
+
+    def __call__(self, func):
+        if iscoroutinefunction(func):
+            raise TypeError('Cannot use timed on a coroutine function.')
+        if not self.metric:
+            self.metric = '%s.%s' % (func.__module__, func.__name__)
+
+        @wraps(func)
+        def wrapped(*args, **kw):
+            start = time.monotonic()
+            try:
+                return func(*args, **kw)
+            finally:
+                self._send(start)
+        return wrapped
+
+    def __enter__(self):
+        if not self.metric:
+            raise TypeError('Cannot use timed without a metric.')
+        self.start = time.monotonic()
+        return self
+
+    def _send(self, start):
+        elapsed = time.monotonic() - start
+        use_ms = self.use_ms if self.use_ms is not None else self.statsd.use_ms
+        if use_ms:
+            elapsed = int(round(elapsed * 1000))
+        self.statsd.timing(self.metric, elapsed, self.tags, self.sample_rate)
+        self.elapsed = elapsed
 
 
 class StatsClient(DogStatsd):
     """A statsd client."""
 
+    max_metric_prefixes = 1000
+    max_tag_suffixes = 1000
+
+    def __init__(self, *args, **kw):
+        super(StatsClient, self).__init__(*args, **kw)
+        # Keep the recently used metric names and tag tuples, rather
+        # than the first ones seen. Tag tuples can include user
+        # supplied request paths.
+        self._cached_metric_prefix = lru_cache(
+            maxsize=self.max_metric_prefixes)(self._metric_prefix)
+        self._cached_tag_suffix = lru_cache(
+            maxsize=self.max_tag_suffixes)(self._tag_suffix)
+
     def close(self):
         if self.socket:  # pragma: no cover
             self.socket.close()
@@ -234,19 +342,83 @@ class StatsClient(DogStatsd):
     def incr(self, *args, **kw):
         return self.increment(*args, **kw)
 
+    def timed(self, metric=None, tags=None, sample_rate=1, use_ms=None):
+        return MonotonicTimer(self, metric, tags, sample_rate, use_ms)
 
-class DebugStatsClient(StatsClient):
+    def send_batch(self, metrics):
+        """
+        Send multiple unsampled metrics in a single packet.
+
+        :param metrics: A sequence of metric, metric type, value and
+                        tags tuples, for example
+                        ``('request', 'c', 1, ['status:200'])``.
+        """
+        packets = []
+        for metric, metric_type, value, tags in metrics:
+            packet = self._packet(metric, metric_type, value, tags, 1)
+            if packet is not None:
+                packets.append(packet)
+        if packets:
+            self._send('\n'.join(packets))
+
+    def _report(self, metric, metric_type, value, tags, sample_rate):
+        packet = self._packet(metric, metric_type, value, tags, sample_rate)
+        if packet is not None:
+            self._send(packet)
+
+    def _packet(self, metric, metric_type, value, tags, sample_rate):
+        # Format the packet directly, instead of building a list of
+        # payload parts, converting each to a string and joining them.
+        if value is None:
+            return None
+
+        # Unsampled metrics are the common case, only check the
+        # sample rate once and skip the random call for them.
+        if sample_rate == 1:
+            sample = ''
+        elif random() > sample_rate:
+            return None
+        else:
+            sample = '|@%s' % sample_rate
+
+        prefix = self._cached_metric_prefix(metric)
+
+        if isinstance(tags, tuple):
+            # Tag tuples are reused, like the request tags of the
+            # logging tween, so cache their formatted packet suffix.
+            suffix = self._cached_tag_suffix(tags)
+        else:
+            suffix = self._tag_suffix(tags)
+
+        return '%s%s|%s%s%s' % (prefix, value, metric_type, sample, suffix)
+
+    def _metric_prefix(self, metric):
+        if self.namespace:
+            return '%s.%s:' % (self.namespace, metric)
+        return '%s:' % metric
+
+    def _tag_suffix(self, tags):
+        if self.constant_tags:
+            tags = list(tags or ()) + self.constant_tags
+        if not tags:
+            return ''
+        return '|#' + ','.join(tags)
+
+
+class DebugStatsClient(StatsClient, DebugMessages):
     """An in-memory statsd client with an inspectable message queue."""
 
     def __init__(self, *args, **kw):
         super(DebugStatsClient, self).__init__(*args, **kw)
-        self.msgs = deque(maxlen=100)
+        self._init_msgs()
 
     def _clear(self):
-        self.msgs.clear()
+        self._clear_msgs()
 
     def _send_to_server(self, packet):
-        self.msgs.append(packet)
+        # Split batched packets back into one message per metric.
+        for msg in packet.split('\n'):
+            self._add_msg(msg)
 
     def _find_messages(self, msg_type, msg_name, msg_value=None, msg_tags=()):
         data = {
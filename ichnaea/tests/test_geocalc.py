@@ -1,13 +1,16 @@
+import numpy
 import pytest
 
 from ichnaea.geocalc import (
     bbox,
     destination,
     distance,
+    distance_array,
     haversine_distance,
     vincenty_distance,
     latitude_add,
     longitude_add,
+    max_distance,
     random_points,
 )
 from ichnaea import constants
@@ -107,6 +110,30 @@ class TestDistance(object):
         assert round(self.dist(-100.0, -186.0, 0.0, 0.0), 4) == 11112616.8752
 
 
+class TestDistanceArray(object):
+
+    def test_empty(self):
+        result = distance_array(
+            1.0, 1.0, numpy.array([], dtype=numpy.double),
+            numpy.array([], dtype=numpy.double))
+        assert len(result) == 0
+
+    def test_matches_distance(self):
+        lats = numpy.array([1.0, 44.0349396, -90.0], dtype=numpy.double)
+        lons = numpy.array([1.1, -79.4908184, 0.0], dtype=numpy.double)
+        result = distance_array(44.0337065, -79.4908184, lats, lons)
+        assert len(result) == 3
+        for i in range(3):
+            assert result[i] == distance(
+                44.0337065, -79.4908184, lats[i], lons[i])
+
+    def test_mismatched_length(self):
+        with pytest.raises(ValueError):
+            distance_array(
+                1.0, 1.0, numpy.array([1.0, 2.0], dtype=numpy.double),
+                numpy.array([1.0], dtype=numpy.double))
+
+
 class TestHaversineDistance(object):
 
     dist = haversine_distance
@@ -166,6 +193,34 @@ class TestLongitudeAdd(object):
         assert round(longitude_add(1.0, 1.0, 1000), 7) == 1.0089845
 
 
+class TestMaxDistance(object):
+
+    def test_empty(self):
+        points = numpy.empty((0, 2), dtype=numpy.double)
+        assert max_distance(1.0, 1.0, points) == 0.0
+
+    def test_max(self):
+        points = numpy.array([
+            (1.0, 1.1),
+            (44.0349396, -79.4908184),
+            (1.0, 1.0),
+        ], dtype=numpy.double)
+        assert max_distance(1.0, 1.0, points) == distance(
+            1.0, 1.0, 44.0349396, -79.4908184)
+
+    def test_close_candidates(self):
+        # Points in a small box, with nearly equal distances to the
+        # center, need to give the same result as checking all points.
+        lat, lon = (51.5, -0.1)
+        points = numpy.array([
+            (lat + dlat, lon + dlon)
+            for dlat in (-0.01, -0.009, 0.0, 0.009, 0.01)
+            for dlon in (-0.01, -0.009, 0.0, 0.009, 0.01)
+        ], dtype=numpy.double)
+        expected = max([distance(lat, lon, p[0], p[1]) for p in points])
+        assert max_distance(lat, lon, points) == expected
+
+
 class TestRandomPoints(object):
 
     def test_null(self):
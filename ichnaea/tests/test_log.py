@@ -1,5 +1,17 @@
 import time
 
+from pyramid.registry import Registry
+from pyramid.response import Response
+from pyramid.testing import DummyRequest
+import pytest
+
+from ichnaea.log import (
+    _request_tags,
+    DebugStatsClient,
+    log_tween_factory,
+    quote_statsd_path,
+)
+
 
 class TestStatsAPI(object):
 
@@ -23,6 +35,25 @@ class TestStatsAPI(object):
         value = float(msg.split('|')[0].split(':')[1])
         assert 0.7 < value < 10.0
 
+    def test_timed_decorator(self, stats):
+        @stats.timed('metric')
+        def func():
+            time.sleep(0.001)
+            return 1
+
+        assert func() == 1
+        stats.check(timer=[('metric', 1)])
+        msg = stats.msgs[0]
+        value = int(msg.split('|')[0].split(':')[1])
+        assert 0 < value < 10
+
+    def test_timed_coroutine(self, stats):
+        async def func():
+            return 1
+
+        with pytest.raises(TypeError):
+            stats.timed('metric')(func)
+
     def test_mixed(self, stats):
         stats.histogram('metric', 5)
         stats.gauge('metric', 3)
@@ -37,6 +68,50 @@ class TestStatsAPI(object):
             set=['metric'],
             timer=['metric'])
 
+    def test_batch(self, stats):
+        stats.send_batch([
+            ('metric', 'ms', 13, ['tag:value']),
+            ('metric', 'c', 2, None),
+        ])
+        stats.check(
+            total=2,
+            counter=[('metric', 1, 2)],
+            timer=[('metric', 1, 13, ['tag:value'])])
+
+    def test_tag_tuples(self, stats):
+        tags = ('tag:value', 'other:tag')
+        stats.incr('metric', tags=tags)
+        stats.incr('metric', tags=tags)
+        stats.incr('metric', tags=list(tags))
+        stats.check(counter=[('metric', 3, 1, list(tags))])
+
+    def test_tag_tuples_evicted(self):
+        stats = DebugStatsClient()
+        for i in range(stats.max_tag_suffixes + 1):
+            stats.incr('metric', tags=('path:%s' % i,))
+        stats.incr('metric', tags=('path:popular',))
+        stats.incr('metric', tags=('path:popular',))
+        info = stats._cached_tag_suffix.cache_info()
+        assert info.currsize == stats.max_tag_suffixes
+        assert info.hits == 1
+
+    def test_buffered(self, stats):
+        with stats:
+            stats.incr('metric', 2)
+            stats.gauge('metric', 3)
+        stats.check(
+            total=2,
+            counter=[('metric', 1, 2)],
+            gauge=[('metric', 1, 3)])
+
+    def test_max_messages(self, stats):
+        for i in range(150):
+            stats.incr('metric', i + 1)
+        msgs = stats.msgs
+        assert len(msgs) == 100
+        assert msgs[0] == 'metric:51|c'
+        assert msgs[-1] == 'metric:150|c'
+
     def test_one_tag(self, stats):
         stats.incr('metric', 1, tags=['tag:value'])
         stats.check(
@@ -46,3 +121,41 @@ class TestStatsAPI(object):
         stats.incr('metric', 1, tags=['t2:v2', 't1:v1'])
         stats.check(
             counter=[('metric', 1, 1, ['t2:v2', 't1:v1'])])
+
+    def test_tag_tuples_constant_tags(self):
+        stats = DebugStatsClient(constant_tags=['env:test'])
+        tags = _request_tags('/v1/geolocate', 'POST')
+        stats.incr('request', tags=tags)
+        stats.timing('request', 13, tags=tags)
+        stats.check(
+            counter=[('request', 1, 1,
+                      ['path:v1.geolocate', 'method:post', 'env:test'])],
+            timer=[('request', 1, 13,
+                    ['path:v1.geolocate', 'method:post', 'env:test'])])
+
+
+class TestQuoteStatsdPath(object):
+
+    def test_path(self):
+        assert quote_statsd_path('/v1/geolocate') == 'v1.geolocate'
+
+    def test_email(self):
+        assert (quote_statsd_path('/v1/country/@user') ==
+                'v1.country.-user')
+
+
+class TestLogTween(object):
+
+    def test_unlisted_status(self, raven, stats):
+        registry = Registry()
+        registry.raven_client = raven
+        registry.skip_logging = frozenset()
+        registry.stats_client = stats
+        tween = log_tween_factory(
+            lambda request: Response(status=418), registry)
+        response = tween(DummyRequest(path='/v1/teapot'))
+        assert response.status_code == 418
+        stats.check(
+            counter=[('request', 1, 1,
+                      ['path:v1.teapot', 'method:get', 'status:418'])],
+            timer=[('request', 1, ['path:v1.teapot', 'method:get'])])